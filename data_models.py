@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class AntibioticSusceptibility:
     """
     Individual antibiotic susceptibility result from culture report.
@@ -27,7 +27,7 @@ class AntibioticSusceptibility:
     notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class CultureReport:
     """
     Structured representation of a single culture lab report.
@@ -53,7 +53,36 @@ class CultureReport:
     raw_text: str
 
 
-@dataclass
+@dataclass(slots=True)
+class CultureReportBatch:
+    """
+    Column-oriented (struct-of-arrays) view of a sequence of CultureReports.
+
+    Built once per analysis so the trend engine can scan each field as a
+    single column instead of walking report objects and their nested
+    susceptibility tables repeatedly.
+
+    Fields:
+        dates: ISO date per report, in report order
+        organisms: Organism name per report
+        cfu: CFU/mL value per report
+        resistance_markers: Resistance marker list per report
+        contamination_flags: Contamination flag per report
+        antibiotic_names: Column labels for interpretation_matrix (display case)
+        interpretation_matrix: One row per report, one column per antibiotic;
+            0 = S, 1 = I, 2 = R, -1 = not tested / unrecognised
+    """
+
+    dates: List[str]
+    organisms: List[str]
+    cfu: List[int]
+    resistance_markers: List[List[str]]
+    contamination_flags: List[bool]
+    antibiotic_names: List[str] = field(default_factory=list)
+    interpretation_matrix: List[List[int]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
 class TrendResult:
     """
     Temporal comparison analysis across multiple culture reports.
@@ -89,7 +118,7 @@ class TrendResult:
     evolved_antibiotics: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class HypothesisResult:
     """
     Rule-generated hypothesis with confidence scoring.
@@ -109,7 +138,7 @@ class HypothesisResult:
     requires_clinician_review: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class MedGemmaPayload:
     """
     Structured payload for MedGemma model inference.
@@ -132,7 +161,7 @@ class MedGemmaPayload:
     output_schema: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class FormattedOutput:
     """
     Final rendered output for either Patient or Clinician mode.
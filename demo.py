@@ -10,7 +10,7 @@ Scenario C: Contamination (mixed flora, low CFU)
 from data_models import CultureReport
 from trend import analyze_trend
 from hypothesis import generate_hypothesis
-from medgemma import load_medgemma, call_medgemma
+from medgemma import load_medgemma, call_medgemma_batch
 from renderer import render_patient_output, render_clinician_output, display_output
 
 # ---------------------------------------------------------------------------
@@ -23,6 +23,41 @@ if is_stub:
 else:
     print("MedGemma loaded on GPU.")
 
+# ---------------------------------------------------------------------------
+# Scenario data: (date, organism, cfu, resistance_markers, contamination_flag)
+# Plain tuples built once at import; re-running a scenario cell only pays for
+# the CultureReport construction below.
+# ---------------------------------------------------------------------------
+_SCENARIO_DATA = {
+    "A": (
+        ("2026-01-01", "Escherichia coli", 120000, (), False),
+        ("2026-01-10", "Escherichia coli", 40000, (), False),
+        ("2026-01-20", "Escherichia coli", 5000, (), False),
+    ),
+    "B": (
+        ("2026-01-01", "Klebsiella pneumoniae", 90000, (), False),
+        ("2026-01-10", "Klebsiella pneumoniae", 80000, (), False),
+        ("2026-01-20", "Klebsiella pneumoniae", 75000, ("ESBL",), False),
+    ),
+    "C": (
+        ("2026-01-01", "mixed flora", 5000, (), True),
+        ("2026-01-10", "mixed flora", 3000, (), True),
+    ),
+}
+
+
+def _scenario_report(
+    date: str,
+    organism: str,
+    cfu: int,
+    markers: tuple = (),
+    contamination: bool = False,
+) -> CultureReport:
+    """Build a urine CultureReport with no susceptibility table."""
+    return CultureReport(
+        date, organism, cfu, list(markers), [], "urine", contamination, "<raw>"
+    )
+
 
 def run_scenario(
     name: str,
@@ -38,22 +73,25 @@ def run_scenario(
         print(f"Expected: {expected_notes}")
     print("=" * 60)
 
-    # Sort by date (oldest first)
-    sorted_reports = sorted(reports, key=lambda r: r.date)
+    # Scenarios are defined oldest-first (ISO dates compare lexicographically),
+    # so there is nothing to sort; analyze_trend expects chronological input.
+    assert all(
+        a.date <= b.date for a, b in zip(reports, reports[1:])
+    ), f"{name}: reports must be in chronological order"
 
     # Pipeline
-    trend = analyze_trend(sorted_reports)
-    hypothesis = generate_hypothesis(trend, len(sorted_reports))
+    trend = analyze_trend(reports)
+    hypothesis = generate_hypothesis(trend, len(reports))
 
-    patient_response = call_medgemma(
-        trend, hypothesis, "patient", model, tokenizer, is_stub, sorted_reports
-    )
-    clinician_response = call_medgemma(
-        trend, hypothesis, "clinician", model, tokenizer, is_stub, sorted_reports
+    # One batched generation pass for both output modes
+    responses = call_medgemma_batch(
+        trend, hypothesis, ["patient", "clinician"], model, tokenizer, is_stub, reports
     )
+    patient_response = responses["patient"]
+    clinician_response = responses["clinician"]
 
-    patient_out = render_patient_output(trend, hypothesis, patient_response, sorted_reports)
-    clinician_out = render_clinician_output(trend, hypothesis, clinician_response, sorted_reports)
+    patient_out = render_patient_output(trend, hypothesis, patient_response, reports)
+    clinician_out = render_clinician_output(trend, hypothesis, clinician_response, reports)
 
     display_output(patient_out, clinician_out, scenario_name=name)
 
@@ -69,13 +107,7 @@ def run_scenario(
 # ---------------------------------------------------------------------------
 # Cell H-1: Scenario A — Improving Infection
 # ---------------------------------------------------------------------------
-scenario_a = [
-    CultureReport(
-        "2026-01-01", "Escherichia coli", 120000, [], [], "urine", False, "<raw>"
-    ),
-    CultureReport("2026-01-10", "Escherichia coli", 40000, [], [], "urine", False, "<raw>"),
-    CultureReport("2026-01-20", "Escherichia coli", 5000, [], [], "urine", False, "<raw>"),
-]
+scenario_a = [_scenario_report(*row) for row in _SCENARIO_DATA["A"]]
 
 run_scenario(
     name="Scenario A — Improving Infection",
@@ -86,17 +118,7 @@ run_scenario(
 # ---------------------------------------------------------------------------
 # Cell H-2: Scenario B — Emerging Resistance
 # ---------------------------------------------------------------------------
-scenario_b = [
-    CultureReport(
-        "2026-01-01", "Klebsiella pneumoniae", 90000, [], [], "urine", False, "<raw>"
-    ),
-    CultureReport(
-        "2026-01-10", "Klebsiella pneumoniae", 80000, [], [], "urine", False, "<raw>"
-    ),
-    CultureReport(
-        "2026-01-20", "Klebsiella pneumoniae", 75000, ["ESBL"], [], "urine", False, "<raw>"
-    ),
-]
+scenario_b = [_scenario_report(*row) for row in _SCENARIO_DATA["B"]]
 
 run_scenario(
     name="Scenario B — Emerging Resistance",
@@ -107,10 +129,7 @@ run_scenario(
 # ---------------------------------------------------------------------------
 # Cell H-3: Scenario C — Contamination
 # ---------------------------------------------------------------------------
-scenario_c = [
-    CultureReport("2026-01-01", "mixed flora", 5000, [], [], "urine", True, "<raw>"),
-    CultureReport("2026-01-10", "mixed flora", 3000, [], [], "urine", True, "<raw>"),
-]
+scenario_c = [_scenario_report(*row) for row in _SCENARIO_DATA["C"]]
 
 run_scenario(
     name="Scenario C — Contamination",
@@ -3,20 +3,94 @@ CultureSense Extraction Layer
 Parses free-text culture reports into typed CultureReport dataclasses.
 """
 
+import bisect
+import dataclasses
+import functools
 import json
+import os
 import re
 import tempfile
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, Any
 
 from data_models import CultureReport, AntibioticSusceptibility
-from rules import RULES, normalize_organism
+from rules import RULES, ORGANISM_ALIASES, normalize_organism
+
+# Optional: pyahocorasick scans resistance markers and negations in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: orjson parses MedGemma fallback responses faster than json.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+# the same exception either way.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 
 # ---------------------------------------------------------------------------
 # Helper: Docling Processing
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def _docling_available() -> bool:
+    """
+    Return True if Docling can be imported.
+
+    Probed on first use rather than at module import, since importing
+    Docling pulls in its model stack; the answer is cached after that.
+    """
+    try:
+        import docling.document_converter  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def get_docling_converter():
+    """
+    Return the shared Docling DocumentConverter, created on first use.
+
+    Raises ImportError if Docling is not installed.
+    """
+    from docling.document_converter import DocumentConverter
+
+    return DocumentConverter()
+
+
+def _maybe_path(text: str) -> Optional[Path]:
+    """
+    Return text as a Path if it names an existing file, else None.
+
+    Report text that cannot be a path (multi-line, longer than PATH_MAX, or
+    containing NUL) is rejected without touching the filesystem.
+    """
+    if not text or len(text) > 4096 or "\n" in text or "\x00" in text:
+        return None
+    path = Path(text)
+    try:
+        return path if path.is_file() else None
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _docling_markdown(path: str, mtime_ns: int) -> str:
+    """
+    Convert a document file to markdown with Docling.
+
+    Memoized per (path, modification time), so re-processing an unchanged
+    file reuses the earlier conversion.
+    """
+    result = get_docling_converter().convert(Path(path))
+    return result.document.export_to_markdown()
+
+
 def _process_with_docling(input_text: str) -> str:
     """
     Process input text using Docling.
@@ -25,27 +99,17 @@ def _process_with_docling(input_text: str) -> str:
     Otherwise, writes text to a temporary file and processes it.
     Returns the structured markdown text from the document.
     """
-    try:
-        from docling.document_converter import DocumentConverter
-    except ImportError:
+    if not _docling_available():
         # Silently fail or log debug if needed, but for user-facing, return original text
         # Only warn once if desired, but here we just return
         return input_text
 
-    input_path = Path(input_text)
-    try:
-        is_file = input_path.exists() and input_path.is_file()
-    except OSError:
-        # Input text is too long to be a valid file path
-        is_file = False
+    input_path = _maybe_path(input_text)
 
     try:
-        converter = DocumentConverter()
-
-        if is_file:
+        if input_path is not None:
             # Process directly from file path
-            result = converter.convert(input_path)
-            return result.document.export_to_markdown()
+            return _docling_markdown(input_text, input_path.stat().st_mtime_ns)
         else:
             # Input is raw text; Docling processing via temp file may distort layout (e.g. merging lines).
             # Fallback to returning raw text so regexes can use original newlines.
@@ -71,6 +135,7 @@ class ExtractionError(ValueError):
 
 # Organism: Multiple patterns to handle various lab report formats
 # Fixed: Use greedy match that captures until newline but handles dots in names like "E. coli"
+# Case-insensitive, so it also covers all-caps "ORGANISM:" labels
 _RE_ORGANISM_PRIMARY = re.compile(r"Organism:\s*([^.].*?)(?:\n|$)", re.IGNORECASE)
 _RE_ORGANISM_ALT1 = re.compile(
     r"Organism\s+identified:\s*([^.].*?)(?:\n|$)", re.IGNORECASE
@@ -80,7 +145,8 @@ _RE_ORGANISM_ALT3 = re.compile(r"Identification:\s*([^.].*?)(?:\n|$)", re.IGNORE
 _RE_ORGANISM_ALT4 = re.compile(
     r"Culture\s+results?:\s*([^.].*?)(?:\n|$)", re.IGNORECASE
 )
-_RE_ORGANISM_ALT5 = re.compile(r"ORGANISM:\s*([^.].*?)(?:\n|$)", re.IGNORECASE)
+# Sentence-ending punctuation that truncates a captured organism name
+_RE_ORG_SENTENCE_END = re.compile(r"[;!?]|\.\s+[A-Z]")
 
 # CFU/mL: Multiple patterns for various formats
 _RE_CFU_PRIMARY = re.compile(r"CFU[/\\]?m?L?:\s*([><]?\s*[\d,]+)", re.IGNORECASE)
@@ -92,6 +158,8 @@ _RE_CFU_ALT1 = re.compile(
 _RE_CFU_ALT2 = re.compile(r"(?<![<\d,;])(\d[\d,]*)\s*(?:CFU|colonies|cells)", re.IGNORECASE)
 _RE_CFU_ALT3 = re.compile(r">\s*?([\d,]+)", re.IGNORECASE)  # >100,000
 _RE_CFU_ALT4 = re.compile(r"(\d{1,3},\d{3})", re.IGNORECASE)  # 5,000 or 100,000 pattern
+# The ",ddd" group every _RE_CFU_ALT4 match contains
+_RE_CFU_THOUSANDS = re.compile(r",\d{3}")
 
 # Fallback CFU patterns
 _RE_CFU_SCIENTIFIC = re.compile(r"10\^(\d+)", re.IGNORECASE)  # 10^5 → 100000
@@ -109,18 +177,42 @@ _RE_DATE_PRIMARY = re.compile(
 _RE_DATE_ALT1 = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")  # ISO format anywhere
 _RE_DATE_ALT2 = re.compile(r"\b(\d{2}/\d{2}/\d{4})\b")  # MM/DD/YYYY anywhere
 _RE_DATE_ALT3 = re.compile(r"\b(\d{2}-\d{2}-\d{4})\b")  # MM-DD-YYYY anywhere
+# "Collected:" label — tried before the other date patterns
+_RE_DATE_COLLECTED = re.compile(
+    r"Collected:\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4})",
+    re.IGNORECASE,
+)
 
 # Resistance markers: exact case-insensitive word boundaries
-_RE_RESISTANCE = re.compile(r"\b(ESBL|CRE|MRSA|VRE|CRKP)\b", re.IGNORECASE)
+_RESISTANCE_MARKERS = ("ESBL", "CRE", "MRSA", "VRE", "CRKP")
+_RE_RESISTANCE = re.compile(
+    r"\b(" + "|".join(_RESISTANCE_MARKERS) + r")\b", re.IGNORECASE
+)
+_RESISTANCE_FOLDED = tuple(m.casefold() for m in _RESISTANCE_MARKERS)
+_VALID_MARKERS = frozenset(_RESISTANCE_MARKERS)
 
 # Susceptibility table patterns
+# Cells are captured whole and stripped by the caller: padding the text cells
+# with \s* on both sides of a lazy [^|]+? made a failing row cubic in the
+# length of its whitespace runs.
 _RE_SUSCEPTIBILITY_ROW = re.compile(
-    r'\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*(Sensitive|Intermediate|Resistant|S|I|R)\s*\|\s*([^|]*)\|\s*([^|]*)\|',
+    r'\|([^|]+)\|([^|]+)\|\s*(Sensitive|Intermediate|Resistant|S|I|R)\s*\|([^|]*)\|([^|]*)\|',
     re.IGNORECASE
 )
 
+# Each separator run between the fields is consumed by the first quantifier
+# that can take it (the name starts after the label's run and ends on a
+# non-separator, an optional ":" run only starts at a colon), so a long run of
+# spaces after a label no longer has exponentially many ways to be split up
+# before the match fails. The MIC may only end on a value character or a unit,
+# and a blank MIC (a lone space) is only tried at the last space of its run;
+# the earlier split points all lead to the same failure, so skipping them
+# keeps a failing match linear in the length of the padding.
 _RE_SUSCEPTIBILITY_ALT = re.compile(
-    r'(?:Antibiotic|Antimicrobial|Agent)[\s:]+([^\n]+?)[\s,]+(?:MIC)?[\s:]*([\d<>.=\s]+(?:ug/mL|mcg/mL|mg/L)?)[\s,]+(?:Interpretation)?[\s:]*(S|I|R|Sensitive|Intermediate|Resistant)',
+    r'(?:Antibiotic|Antimicrobial|Agent)[\s:]+([^\s:]|[^\s:][^\n]*?[^\s,])[\s,]+(?:MIC[\s:]*|:[\s:]*)?'
+    r'((?:[\d<>.=](?:[\d<>.=\s]*[\d<>.=])?|\s(?=ug/mL|mcg/mL|mg/L|,|\s(?![\s,])))'
+    r'(?:\s*(?:ug/mL|mcg/mL|mg/L))?)'
+    r'[\s,]+(?:Interpretation[\s:]*|:[\s:]*)?(S|I|R|Sensitive|Intermediate|Resistant)',
     re.IGNORECASE
 )
 
@@ -137,6 +229,15 @@ _RE_SIMPLE_SUSCEPTIBILITY = re.compile(
 
 # Negation words to check around resistance markers (for context-aware extraction)
 _NEGATION_WORDS = ["no ", "not ", "none", "without", "negative for", "undetected", "ruled out"]
+# Any negation word, matched case-insensitively through explicit [xX] classes:
+# re.IGNORECASE would also let "i" match the Turkish dotted/dotless I, which
+# the original .lower()-and-substring check never did
+_RE_NEGATION = re.compile(
+    "|".join(
+        "".join(f"[{c}{c.upper()}]" if c.isalpha() else re.escape(c) for c in word)
+        for word in _NEGATION_WORDS
+    )
+)
 
 # Specimen type - ENHANCED: multiple patterns and keyword detection
 _RE_SPECIMEN_PRIMARY = re.compile(
@@ -167,13 +268,126 @@ _RE_SPECIMEN_STOOL_KEYWORD = re.compile(
     r"\b(stool|fecal|faecal|feces|gi)\b", re.IGNORECASE
 )
 
+# Specimen variations mapped to standard types; anything else passes through
+_SPECIMEN_NORM = {
+    "urine": "urine",
+    "urinary": "urine",
+    "stool": "stool",
+    "fecal": "stool",
+    "faecal": "stool",
+    "feces": "stool",
+    "wound": "wound",
+    "blood": "blood",
+}
+
+
+# ---------------------------------------------------------------------------
+# Lowercase-text twins of the case-insensitive organism / CFU / date /
+# specimen patterns
+# ---------------------------------------------------------------------------
+# re.IGNORECASE case-folds at every character and disables re's literal-prefix
+# search. For ASCII text the parsers lowercase the text once and run these
+# case-sensitive twins over it instead. The twins only capture digits or words
+# the parsers lowercase anyway, except the organism name, which
+# _parse_organism slices from the original text by offset. Non-ASCII text
+# keeps the original patterns, because Unicode case folding and str.lower()
+# disagree on a few characters. Since twins only ever see ASCII text they are
+# compiled with re.ASCII, whose \d, \s and \b tests are cheaper than the
+# Unicode ones and give the same answers there.
+def _lowercase_twin(pattern: re.Pattern) -> re.Pattern:
+    """Compile a case-sensitive copy of pattern for lowercase ASCII text."""
+    source = pattern.pattern
+    # Lowercasing the source is only sound when no escape is uppercase
+    # (\S, \D, \W, \B, \A, \Z would flip meaning)
+    assert not re.search(r"\\[A-Z]", source.replace("\\\\", "")), source
+    flags = pattern.flags & ~(re.IGNORECASE | re.UNICODE)
+    return re.compile(source.lower(), flags | re.ASCII)
+
+
+_LOWER_TWINS = {
+    pattern: _lowercase_twin(pattern)
+    for pattern in (
+        _RE_ORGANISM_PRIMARY,
+        _RE_ORGANISM_ALT1,
+        _RE_ORGANISM_ALT2,
+        _RE_ORGANISM_ALT3,
+        _RE_ORGANISM_ALT4,
+        _RE_CFU_PRIMARY,
+        _RE_CFU_ALT1,
+        _RE_CFU_ALT2,
+        _RE_CFU_ALT3,
+        _RE_CFU_ALT4,
+        _RE_CFU_WORD,
+        _RE_CFU_NO_GROWTH,
+        _RE_CFU_SCIENTIFIC,
+        _RE_CFU_RAW_NUMBER,
+        _RE_DATE_COLLECTED,
+        _RE_DATE_PRIMARY,
+        _RE_SPECIMEN_HEADER,
+        _RE_SPECIMEN_TABLE_CELL,
+        _RE_SPECIMEN_PRIMARY,
+        _RE_SPECIMEN_ALT1,
+        _RE_SPECIMEN_ALT2,
+        _RE_SPECIMEN_URINE_KEYWORD,
+        _RE_SPECIMEN_STOOL_KEYWORD,
+    )
+}
+
+
+# Literals (lowercase) at least one of which occurs in every match of the
+# pattern. Patterns that open with a word alternation, \b or a character class
+# get no literal-prefix search from re and step through the text position by
+# position; a few substring tests on the lowercase text are far cheaper and
+# rule most of those searches out before they start.
+_TWIN_ANCHORS = {
+    _RE_CFU_ALT1: ("count:", "quantity:", "result:"),
+    _RE_CFU_ALT2: ("cfu", "colonies", "cells"),
+    _RE_CFU_WORD: ("tntc", "too"),
+    _RE_CFU_NO_GROWTH: ("no", "cfu", "negative"),
+    _RE_DATE_PRIMARY: ("date", "collected", "reported"),
+    _RE_SPECIMEN_HEADER: ("culture",),
+    _RE_SPECIMEN_PRIMARY: ("specimen", "sample", "source", "type"),
+    _RE_SPECIMEN_ALT1: ("urine", "stool", "wound", "blood"),
+    _RE_SPECIMEN_ALT2: ("urine", "stool", "wound", "blood"),
+    _RE_SPECIMEN_URINE_KEYWORD: ("urin", "bladder", "catheter"),
+    _RE_SPECIMEN_STOOL_KEYWORD: ("stool", "fecal", "faecal", "feces", "gi"),
+}
+
+
+def _ascii_lower(text: str) -> Optional[str]:
+    """text.lower() for ASCII text, else None (use the original patterns)."""
+    return text.lower() if text.isascii() else None
+
+
+def _search(
+    pattern: re.Pattern,
+    text: str,
+    lower: Optional[str] = None,
+    pos: int = 0,
+):
+    """
+    pattern.search(text, pos), through its lowercase twin when possible.
+
+    When lower (text.lower() of ASCII text) is given, the pattern's lowercase
+    twin is searched over it instead, unless none of its anchor literals
+    occur there.
+    """
+    if lower is not None:
+        twin = _LOWER_TWINS.get(pattern)
+        if twin is not None:
+            anchors = _TWIN_ANCHORS.get(pattern)
+            if anchors is not None and not any(a in lower for a in anchors):
+                return None
+            return twin.search(lower, pos)
+    return pattern.search(text, pos)
+
 
 # ---------------------------------------------------------------------------
 # CFU normalisation helper (Section 5.4) - ENHANCED
 # ---------------------------------------------------------------------------
 
 
-def _parse_cfu(report_text: str) -> tuple[int, bool]:
+def _parse_cfu(report_text: str, lower_text: Optional[str] = None) -> tuple[int, bool]:
     """
     Attempt to parse the CFU/mL value from a report text string.
 
@@ -189,9 +403,10 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
         - Missing/unparseable               → 0 with warning
     """
     text = report_text.strip()
+    lower = _ascii_lower(text) if lower_text is None else lower_text.strip()
 
     # 1. Primary: "CFU/mL: 120,000" or "CFU/mL: >100,000"
-    m = _RE_CFU_PRIMARY.search(text)
+    m = _search(_RE_CFU_PRIMARY, text, lower)
     if m:
         raw = m.group(1).replace(",", "").replace(">", "").replace("<", "").strip()
         try:
@@ -200,7 +415,7 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
             pass
 
     # 2. Alternative: "Count: 120,000" or "Result: >100,000"
-    m = _RE_CFU_ALT1.search(text)
+    m = _search(_RE_CFU_ALT1, text, lower)
     if m:
         raw = m.group(1).replace(",", "").replace(">", "").replace("<", "").strip()
         try:
@@ -209,7 +424,7 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
             pass
 
     # 3. Alternative: "120,000 CFU" or "120,000 colonies"
-    m = _RE_CFU_ALT2.search(text)
+    m = _search(_RE_CFU_ALT2, text, lower)
     if m:
         raw = m.group(1).replace(",", "")
         try:
@@ -218,7 +433,7 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
             pass
 
     # 4. Alternative: ">100,000" or "> 100,000"
-    m = _RE_CFU_ALT3.search(text)
+    m = _search(_RE_CFU_ALT3, text, lower)
     if m:
         raw = m.group(1).replace(",", "")
         try:
@@ -226,8 +441,12 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
         except ValueError:
             pass
 
-    # 5. Alternative: standalone 100,000 pattern
-    m = _RE_CFU_ALT4.search(text)
+    # 5. Alternative: standalone 100,000 pattern. Every match contains a
+    # ",ddd" group, which re finds quickly by its leading comma; no match can
+    # start more than three characters before the first one, so the digit-led
+    # scan starts there instead of stepping through the whole text.
+    c = _RE_CFU_THOUSANDS.search(text)
+    m = _search(_RE_CFU_ALT4, text, lower, max(0, c.start() - 3)) if c else None
     if m:
         raw = m.group(1).replace(",", "")
         try:
@@ -236,15 +455,15 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
             pass
 
     # 6. TNTC
-    if _RE_CFU_WORD.search(text):
+    if _search(_RE_CFU_WORD, text, lower):
         return 999999, True
 
     # 7. No growth / negative
-    if _RE_CFU_NO_GROWTH.search(text):
+    if _search(_RE_CFU_NO_GROWTH, text, lower):
         return 0, True
 
     # 8. Scientific notation "10^5"
-    m = _RE_CFU_SCIENTIFIC.search(text)
+    m = _search(_RE_CFU_SCIENTIFIC, text, lower)
     if m:
         try:
             return 10 ** int(m.group(1)), True
@@ -252,7 +471,7 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
             pass
 
     # 9. Bare large integer (≥5 digits) — last resort fallback
-    m = _RE_CFU_RAW_NUMBER.search(text)
+    m = _search(_RE_CFU_RAW_NUMBER, text, lower)
     if m:
         raw = m.group(1).replace(",", "")
         try:
@@ -272,33 +491,38 @@ def _parse_cfu(report_text: str) -> tuple[int, bool]:
     return 0, False
 
 
-def _parse_date(report_text: str) -> str:
+def _parse_date(report_text: str, lower_text: Optional[str] = None) -> str:
     """Extract and normalise the collection date from report text."""
+    lower = _ascii_lower(report_text) if lower_text is None else lower_text
+
     # Look for "Collected:" pattern first (most reliable indicator of collection date)
-    collected_pattern = re.compile(
-        r"Collected:\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4})",
-        re.IGNORECASE
-    )
-    m = collected_pattern.search(report_text)
+    m = _search(_RE_DATE_COLLECTED, report_text, lower)
     if m:
         raw = m.group(1)
         return _normalize_date(raw)
 
     # Primary: prefixed dates (Date:, Date Collected:, etc.)
-    m = _RE_DATE_PRIMARY.search(report_text)
+    m = _search(_RE_DATE_PRIMARY, report_text, lower)
     if m:
         raw = m.group(1)
         return _normalize_date(raw)
 
+    # The "anywhere" patterns below all need a "-" or "/" separator; a plain
+    # substring test skips their position-by-position scans when it is absent
+    has_dash = "-" in report_text
+
     # Alt1: ISO format anywhere (but skip if it looks like a birth date)
-    all_dates = _RE_DATE_ALT1.findall(report_text)
+    all_dates = _RE_DATE_ALT1.findall(report_text) if has_dash else None
     if all_dates:
         # If there's a DATE OF BIRTH field, try to exclude dates near it
-        if "DATE OF BIRTH" in report_text.upper():
+        if lower is not None:
+            birth_pos = lower.find("date of birth")
+        else:
+            birth_pos = report_text.upper().find("DATE OF BIRTH")
+        if birth_pos >= 0:
             # Find all ISO dates and their positions
             for date in all_dates:
                 pos = report_text.find(date)
-                birth_pos = report_text.upper().find("DATE OF BIRTH")
                 # If date is far from DATE OF BIRTH, it's likely collection date
                 if abs(pos - birth_pos) > 50:
                     return date
@@ -307,101 +531,274 @@ def _parse_date(report_text: str) -> str:
         return all_dates[0]
 
     # Alt2: MM/DD/YYYY anywhere
-    m = _RE_DATE_ALT2.search(report_text)
+    m = _RE_DATE_ALT2.search(report_text) if "/" in report_text else None
     if m:
         return _normalize_date(m.group(1))
 
     # Alt3: MM-DD-YYYY anywhere
-    m = _RE_DATE_ALT3.search(report_text)
+    m = _RE_DATE_ALT3.search(report_text) if has_dash else None
     if m:
-        raw = m.group(1).replace("-", "/")
-        return _normalize_date(raw)
+        return _normalize_date(m.group(1))
 
     return "unknown"
 
 
 def _normalize_date(raw: str) -> str:
-    """Convert various date formats to ISO 8601 (YYYY-MM-DD)."""
-    raw = raw.strip()
+    """
+    Convert a captured date to ISO 8601 (YYYY-MM-DD).
+
+    Every caller passes a date pattern capture: YYYY-MM-DD, or MM/DD/YYYY
+    and MM-DD-YYYY (DD first when the first field exceeds 12). The shapes
+    are fixed-width, so the fields are sliced out by position.
+    """
+    if len(raw) != 10:
+        return "unknown"
 
     # Already ISO format
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", raw):
+    if raw[4] == "-":
         return raw
 
-    # MM/DD/YYYY or MM-DD-YYYY
-    if "/" in raw or "-" in raw:
-        sep = "/" if "/" in raw else "-"
-        parts = raw.split(sep)
-        if len(parts) == 3:
-            # Determine if first part is month or day based on values
-            first, second, year = parts[0], parts[1], parts[2]
-            # If first > 12, it's likely DD/MM/YYYY
-            if int(first) > 12:
-                # DD/MM/YYYY → YYYY-MM-DD
-                return f"{year}-{second.zfill(2)}-{first.zfill(2)}"
-            else:
-                # MM/DD/YYYY → YYYY-MM-DD
-                return f"{year}-{first.zfill(2)}-{second.zfill(2)}"
+    first, second, year = raw[0:2], raw[3:5], raw[6:10]
+    if int(first) > 12:
+        # DD/MM/YYYY → YYYY-MM-DD
+        return f"{year}-{second}-{first}"
+    # MM/DD/YYYY → YYYY-MM-DD
+    return f"{year}-{first}-{second}"
 
-    return "unknown"
+
+# Organism aliases longest first (ties keep ORGANISM_ALIASES order), the
+# priority order of the alias fallback in _parse_organism
+_ALIASES_BY_LENGTH = sorted(ORGANISM_ALIASES, key=len, reverse=True)
+_ALIAS_RANK = {alias: rank for rank, alias in enumerate(_ALIASES_BY_LENGTH)}
 
 
-def _parse_organism(report_text: str) -> Optional[str]:
+def _build_alias_automaton():
+    """
+    Compile ORGANISM_ALIASES into an Aho-Corasick automaton.
+
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for alias in _ALIASES_BY_LENGTH:
+        automaton.add_word(alias, alias)
+    automaton.make_automaton()
+    return automaton
+
+
+_ALIAS_AUTOMATON = _build_alias_automaton()
+
+
+def _parse_organism(report_text: str, lower_text: Optional[str] = None) -> Optional[str]:
     """
     Extract organism name from report text with multiple pattern attempts.
     """
     text = report_text.strip()
+    lower = _ascii_lower(text) if lower_text is None else lower_text.strip()
 
-    # Try multiple organism patterns in order
+    # Try multiple organism patterns in order, each with the lowercase label
+    # every one of its matches starts with
     patterns = [
-        _RE_ORGANISM_PRIMARY,
-        _RE_ORGANISM_ALT5,  # ORGANISM: (all caps)
-        _RE_ORGANISM_ALT1,  # Organism identified:
-        _RE_ORGANISM_ALT2,  # Isolated:
-        _RE_ORGANISM_ALT3,  # Identification:
-        _RE_ORGANISM_ALT4,  # Culture result:
+        (_RE_ORGANISM_PRIMARY, "organism:"),
+        (_RE_ORGANISM_ALT1, "organism"),  # Organism identified:
+        (_RE_ORGANISM_ALT2, "isolated:"),  # Isolated:
+        (_RE_ORGANISM_ALT3, "identification:"),  # Identification:
+        (_RE_ORGANISM_ALT4, "culture"),  # Culture result:
     ]
 
-    for pattern in patterns:
-        m = pattern.search(text)
+    for pattern, label in patterns:
+        # Keyword prefilter: a plain find on the lowercase text skips the
+        # case-insensitive scan when the label is absent, and otherwise starts
+        # it at the label's first occurrence
+        pos = 0
+        if lower is not None:
+            pos = lower.find(label)
+            if pos < 0:
+                continue
+        m = _search(pattern, text, lower, pos)
         if m:
-            raw_organism = m.group(1).strip()
-            # Clean up common artifacts but preserve dots in organism names like "E. coli"
-            raw_organism = re.sub(r"\s+", " ", raw_organism)  # normalize whitespace
+            # The match may come from the lowercase twin; lower's offsets line
+            # up with text, so the name is sliced from text to keep its case.
+            # Clean up common artifacts but preserve dots in organism names like "E. coli";
+            # split/join strips and collapses whitespace runs in one C-level pass
+            raw_organism = " ".join(text[m.start(1):m.end(1)].split())
             # Don't split on dots - they're part of organism names like "E. coli"
-            # Only truncate if there's clear sentence-ending punctuation
-            if re.search(r"[;!?]|\.\s+[A-Z]", raw_organism):
-                # Find the first sentence-ending punctuation
-                match = re.search(r"([;!?]|\.\s+[A-Z])", raw_organism)
-                if match:
-                    raw_organism = raw_organism[: match.start()]
+            # Only truncate at the first clear sentence-ending punctuation
+            match = _RE_ORG_SENTENCE_END.search(raw_organism)
+            if match:
+                raw_organism = raw_organism[: match.start()]
             return normalize_organism(raw_organism)
 
-    # Fallback: search for known organism aliases in full text
-    lower_text = text.lower()
-    from rules import ORGANISM_ALIASES
+    # Fallback: search for known organism aliases in full text; the longest
+    # alias present wins
+    lower_text = lower if lower is not None else text.lower()
+    if _ALIAS_AUTOMATON is not None:
+        # One linear scan finds every alias present; pick the best-ranked
+        best = min(
+            (alias for _, alias in _ALIAS_AUTOMATON.iter(lower_text)),
+            key=_ALIAS_RANK.__getitem__,
+            default=None,
+        )
+        return normalize_organism(best) if best is not None else None
 
-    for alias in sorted(ORGANISM_ALIASES.keys(), key=len, reverse=True):
+    for alias in _ALIASES_BY_LENGTH:
         if alias in lower_text:
             return normalize_organism(alias)
 
     return None
 
 
+def _build_resistance_automaton():
+    """
+    Compile the resistance markers and _NEGATION_WORDS into one Aho-Corasick
+    automaton over lowercase text. Values are (is_marker, token).
+
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for marker in _RESISTANCE_MARKERS:
+        automaton.add_word(marker.lower(), (True, marker))
+    for neg in _NEGATION_WORDS:
+        automaton.add_word(neg, (False, neg))
+    automaton.make_automaton()
+    return automaton
+
+
+_RESISTANCE_AUTOMATON = _build_resistance_automaton()
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
 def _parse_resistance_markers(report_text: str) -> list[str]:
     """Extract all high-risk resistance markers (deduplicated, uppercase)."""
+    # The automaton path works on offsets into report_text.lower(), which
+    # line up with report_text only for ASCII; other text takes the regex path
+    if _RESISTANCE_AUTOMATON is None or not report_text.isascii():
+        return _parse_resistance_markers_re(report_text)
+
+    lower = report_text.lower()
+    n = len(lower)
+    markers = []  # (start, end, marker)
+    neg_starts = []
+    neg_ends = []
+    # iter() yields hits in order of end offset; negation words may overlap
+    for last, (is_marker, token) in _RESISTANCE_AUTOMATON.iter(lower):
+        end = last + 1
+        start = end - len(token)
+        if not is_marker:
+            neg_starts.append(start)
+            neg_ends.append(end)
+        elif (start == 0 or not _is_word_char(lower[start - 1])) and (
+            end == n or not _is_word_char(lower[end])
+        ):
+            markers.append((start, end, token))
+
+    order = sorted(range(len(neg_starts)), key=neg_starts.__getitem__)
+    neg_starts = [neg_starts[i] for i in order]
+    neg_ends = [neg_ends[i] for i in order]
+
+    # Deduplicate inline, preserving first-seen order; a repeat of a marker
+    # already kept needs no negation check
+    seen = set()
+    found = []
+    for start, end, marker in markers:
+        if marker in seen:
+            continue
+        # Negated if a negation word lies wholly inside the 60-char window
+        # either side of the marker
+        lo = max(0, start - 60)
+        hi = min(n, end + 60)
+        i = bisect.bisect_left(neg_starts, lo)
+        negated = False
+        while i < len(neg_starts) and neg_starts[i] < hi:
+            if neg_ends[i] <= hi:
+                negated = True
+                break
+            i += 1
+        if not negated:
+            seen.add(marker)
+            found.append(marker)
+            if len(found) == len(_RESISTANCE_MARKERS):
+                break  # every marker already found
+    return found
+
+
+def _parse_resistance_markers_re(report_text: str) -> list[str]:
+    """Regex implementation of _parse_resistance_markers."""
+    # Most reports name no marker at all; substring tests on the case-folded
+    # text (casefold, like re.IGNORECASE, maps e.g. the long s to "s") rule
+    # that out before the position-by-position \b scan
+    folded = report_text.casefold()
+    if not any(marker in folded for marker in _RESISTANCE_FOLDED):
+        return []
+
+    seen = set()
     found = []
     for match in _RE_RESISTANCE.finditer(report_text):
-        marker = match.group(1)
-        # Check 60-char window around match for negation
+        marker = match.group(1).upper()
+        if marker in seen:
+            continue
+        # Check 60-char window around match for negation, searched in place
+        # (pos/endpos) rather than on a lowercased slice
         start = max(0, match.start() - 60)
-        end = min(len(report_text), match.end() + 60)
-        context = report_text[start:end].lower()
-        if any(neg in context for neg in _NEGATION_WORDS):
+        if _RE_NEGATION.search(report_text, start, match.end() + 60):
             continue  # Skip this match - it's in a negation context
+        seen.add(marker)
         found.append(marker)
-    # deduplicate, preserve order
-    return list(dict.fromkeys(m.upper() for m in found))
+        if len(found) == len(_RESISTANCE_MARKERS):
+            break  # every marker already found
+    return found
+
+
+# S/I/R interpretation spellings (upper-cased) → canonical code
+_INTERP_MAP = {
+    "S": "S",
+    "SENSITIVE": "S",
+    "I": "I",
+    "INTERMEDIATE": "I",
+    "R": "R",
+    "RESISTANT": "R",
+}
+
+# Table header words that are never antibiotic names
+_HEADER_WORDS = frozenset(("antibiotic", "agent", "drug", "name"))
+
+
+def _add_susceptibility(
+    profile: list[AntibioticSusceptibility],
+    seen_antibiotics: set[str],
+    antibiotic: str,
+    mic: str,
+    interpretation: str,
+    breakpoints: str = "",
+    notes: str = "",
+) -> None:
+    """
+    Append one susceptibility entry unless the antibiotic name is invalid
+    (too short or a header word) or was already recorded.
+    """
+    # Skip if not a valid antibiotic name (too short or looks like a header)
+    antibiotic_lower = antibiotic.lower()
+    if len(antibiotic) < 3 or antibiotic_lower in _HEADER_WORDS:
+        return
+
+    # Deduplicate
+    if antibiotic_lower in seen_antibiotics:
+        return
+    seen_antibiotics.add(antibiotic_lower)
+
+    profile.append(AntibioticSusceptibility(
+        antibiotic=antibiotic,
+        mic=mic,
+        interpretation=interpretation,
+        breakpoints=breakpoints,
+        notes=notes
+    ))
 
 
 def _parse_susceptibility_profile(report_text: str) -> list[AntibioticSusceptibility]:
@@ -419,134 +816,53 @@ def _parse_susceptibility_profile(report_text: str) -> list[AntibioticSusceptibi
 
     # Pattern 1: Markdown table rows | Antibiotic | MIC | Interpretation | ...
     for match in _RE_SUSCEPTIBILITY_ROW.finditer(report_text):
-        antibiotic = match.group(1).strip()
-        mic = match.group(2).strip()
         interp_raw = match.group(3).strip().upper()
-        breakpoints = match.group(4).strip() if len(match.groups()) >= 4 else ""
-        notes = match.group(5).strip() if len(match.groups()) >= 5 else ""
-
-        # Normalize interpretation to S/I/R
-        if interp_raw in ("S", "SENSITIVE"):
-            interpretation = "S"
-        elif interp_raw in ("I", "INTERMEDIATE"):
-            interpretation = "I"
-        elif interp_raw in ("R", "RESISTANT"):
-            interpretation = "R"
-        else:
-            interpretation = interp_raw
-
-        # Skip if not a valid antibiotic name (too short or looks like a header)
-        if len(antibiotic) < 3 or antibiotic.lower() in ("antibiotic", "agent", "drug", "name"):
-            continue
-
-        # Deduplicate
-        antibiotic_lower = antibiotic.lower()
-        if antibiotic_lower in seen_antibiotics:
-            continue
-        seen_antibiotics.add(antibiotic_lower)
-
-        profile.append(AntibioticSusceptibility(
-            antibiotic=antibiotic,
-            mic=mic,
-            interpretation=interpretation,
-            breakpoints=breakpoints,
-            notes=notes
-        ))
+        _add_susceptibility(
+            profile,
+            seen_antibiotics,
+            match.group(1).strip(),
+            match.group(2).strip(),
+            _INTERP_MAP.get(interp_raw, interp_raw),
+            match.group(4).strip(),
+            match.group(5).strip(),
+        )
 
     # Pattern 2: Alternative format (Antibiotic, MIC, Interpretation inline)
     for match in _RE_SUSCEPTIBILITY_ALT.finditer(report_text):
-        antibiotic = match.group(1).strip()
-        mic = match.group(2).strip() if len(match.groups()) >= 2 else ""
-        interp_raw = match.group(3).strip().upper() if len(match.groups()) >= 3 else ""
-
-        if interp_raw in ("S", "SENSITIVE"):
-            interpretation = "S"
-        elif interp_raw in ("I", "INTERMEDIATE"):
-            interpretation = "I"
-        elif interp_raw in ("R", "RESISTANT"):
-            interpretation = "R"
-        else:
+        interpretation = _INTERP_MAP.get(match.group(3).strip().upper())
+        if interpretation is None:
             continue  # Skip if no valid interpretation
-
-        if len(antibiotic) < 3 or antibiotic.lower() in ("antibiotic", "agent", "drug", "name"):
-            continue
-
-        antibiotic_lower = antibiotic.lower()
-        if antibiotic_lower in seen_antibiotics:
-            continue
-        seen_antibiotics.add(antibiotic_lower)
-
-        profile.append(AntibioticSusceptibility(
-            antibiotic=antibiotic,
-            mic=mic,
-            interpretation=interpretation,
-            breakpoints="",
-            notes=""
-        ))
+        _add_susceptibility(
+            profile,
+            seen_antibiotics,
+            match.group(1).strip(),
+            match.group(2).strip(),
+            interpretation,
+        )
 
     # Pattern 3: Simple line format
     for match in _RE_ANTIBIOTIC_LINE.finditer(report_text):
-        antibiotic = match.group(1).strip()
-        mic = match.group(2).strip()
         interp_raw = match.group(3).strip().upper()
-
-        if interp_raw in ("S", "SENSITIVE"):
-            interpretation = "S"
-        elif interp_raw in ("I", "INTERMEDIATE"):
-            interpretation = "I"
-        elif interp_raw in ("R", "RESISTANT"):
-            interpretation = "R"
-        else:
-            interpretation = interp_raw
-
-        if len(antibiotic) < 3 or antibiotic.lower() in ("antibiotic", "agent", "drug", "name"):
-            continue
-
-        antibiotic_lower = antibiotic.lower()
-        if antibiotic_lower in seen_antibiotics:
-            continue
-        seen_antibiotics.add(antibiotic_lower)
-
-        profile.append(AntibioticSusceptibility(
-            antibiotic=antibiotic,
-            mic=mic,
-            interpretation=interpretation,
-            breakpoints="",
-            notes=""
-        ))
+        _add_susceptibility(
+            profile,
+            seen_antibiotics,
+            match.group(1).strip(),
+            match.group(2).strip(),
+            _INTERP_MAP.get(interp_raw, interp_raw),
+        )
 
     # Pattern 4: Simple "Antibiotic: S" format (common in manual entry)
     for match in _RE_SIMPLE_SUSCEPTIBILITY.finditer(report_text):
-        antibiotic = match.group(1).strip()
-        interp_raw = match.group(2).strip().upper()
-
-        # Normalize interpretation to S/I/R
-        if interp_raw in ("S", "SENSITIVE"):
-            interpretation = "S"
-        elif interp_raw in ("I", "INTERMEDIATE"):
-            interpretation = "I"
-        elif interp_raw in ("R", "RESISTANT"):
-            interpretation = "R"
-        else:
+        interpretation = _INTERP_MAP.get(match.group(2).strip().upper())
+        if interpretation is None:
             continue  # Skip if not a valid interpretation
-
-        # Skip if not a valid antibiotic name (too short or looks like a header)
-        if len(antibiotic) < 3 or antibiotic.lower() in ("antibiotic", "agent", "drug", "name"):
-            continue
-
-        # Deduplicate
-        antibiotic_lower = antibiotic.lower()
-        if antibiotic_lower in seen_antibiotics:
-            continue
-        seen_antibiotics.add(antibiotic_lower)
-
-        profile.append(AntibioticSusceptibility(
-            antibiotic=antibiotic,
-            mic="",  # No MIC in simple format
-            interpretation=interpretation,
-            breakpoints="",
-            notes=""
-        ))
+        _add_susceptibility(
+            profile,
+            seen_antibiotics,
+            match.group(1).strip(),
+            "",  # No MIC in simple format
+            interpretation,
+        )
 
     return profile
 
@@ -556,78 +872,86 @@ def _format_susceptibility_summary(profile: list[AntibioticSusceptibility]) -> s
     if not profile:
         return ""
 
-    s_count = sum(1 for a in profile if a.interpretation == "S")
-    i_count = sum(1 for a in profile if a.interpretation == "I")
-    r_count = sum(1 for a in profile if a.interpretation == "R")
+    s_count = i_count = r_count = 0
+    for a in profile:
+        interpretation = a.interpretation
+        if interpretation == "S":
+            s_count += 1
+        elif interpretation == "I":
+            i_count += 1
+        elif interpretation == "R":
+            r_count += 1
 
     total = len(profile)
     return f"{total} antibiotics: {s_count}S/{i_count}I/{r_count}R"
 
 
-def _parse_specimen(report_text: str) -> str:
+def _parse_specimen(report_text: str, lower_text: Optional[str] = None) -> str:
     """
     Extract specimen type with multiple pattern attempts and keyword detection.
     Returns 'urine', 'stool', 'wound', 'blood', or 'unknown'.
     """
     text = report_text.strip()
-
-    # Try markdown headers and bold text: ## Urine Culture, **Urine Culture**
-    m = _RE_SPECIMEN_HEADER.search(text)
-    if m:
-        return _normalize_specimen(m.group(1).lower())
-
-    # Try table cell format: | Specimen Type | Urine | (Quest Diagnostics format)
-    m = _RE_SPECIMEN_TABLE_CELL.search(text)
-    if m:
-        return _normalize_specimen(m.group(1).lower())
-
-    # Try primary pattern: Specimen/Sample/Source/Type: urine/stool
-    m = _RE_SPECIMEN_PRIMARY.search(text)
-    if m:
-        specimen = m.group(1).lower()
-        return _normalize_specimen(specimen)
-
-    # Try alternative: urine/stool culture
-    m = _RE_SPECIMEN_ALT1.search(text)
-    if m:
-        return _normalize_specimen(m.group(1).lower())
-
-    # Try alternative: culture: urine/stool
-    m = _RE_SPECIMEN_ALT2.search(text)
-    if m:
-        return _normalize_specimen(m.group(1).lower())
+    lower = _ascii_lower(text) if lower_text is None else lower_text.strip()
+
+    for pattern in (
+        # Markdown headers and bold text: ## Urine Culture, **Urine Culture**
+        _RE_SPECIMEN_HEADER,
+        # Table cell format: | Specimen Type | Urine | (Quest Diagnostics format)
+        _RE_SPECIMEN_TABLE_CELL,
+        # Primary pattern: Specimen/Sample/Source/Type: urine/stool
+        _RE_SPECIMEN_PRIMARY,
+        # Alternative: urine/stool culture
+        _RE_SPECIMEN_ALT1,
+        # Alternative: culture: urine/stool
+        _RE_SPECIMEN_ALT2,
+    ):
+        m = _search(pattern, text, lower)
+        if m:
+            # A lowercase twin's capture is already lowercase
+            specimen = m.group(1) if lower is not None else m.group(1).lower()
+            return _normalize_specimen(specimen)
 
     # Keyword detection: look for urine/urinary keywords anywhere
-    if _RE_SPECIMEN_URINE_KEYWORD.search(text):
+    if _search(_RE_SPECIMEN_URINE_KEYWORD, text, lower):
         return "urine"
 
     # Keyword detection: look for stool/fecal keywords anywhere
-    if _RE_SPECIMEN_STOOL_KEYWORD.search(text):
+    if _search(_RE_SPECIMEN_STOOL_KEYWORD, text, lower):
         return "stool"
 
     return "unknown"
 
 
 def _normalize_specimen(specimen: str) -> str:
-    """Normalize specimen type to standard values."""
-    specimen = specimen.lower().strip()
+    """Normalize a lowercase specimen type to standard values."""
+    return _SPECIMEN_NORM.get(specimen, specimen)
 
-    # Map variations to standard types
-    if specimen in ("urine", "urinary"):
-        return "urine"
-    elif specimen in ("stool", "fecal", "faecal", "feces"):
-        return "stool"
-    elif specimen == "wound":
-        return "wound"
-    elif specimen == "blood":
-        return "blood"
 
-    return specimen
+def _build_contamination_automaton():
+    """
+    Compile RULES["contamination_terms"] into an Aho-Corasick automaton.
+
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in RULES["contamination_terms"]:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+_CONTAMINATION_AUTOMATON = _build_contamination_automaton()
 
 
 def _is_contamination(organism: str) -> bool:
     """Return True if the organism name matches any contamination term."""
     lower = organism.lower()
+    if _CONTAMINATION_AUTOMATON is not None:
+        # One scan over the name, stopping at the first term found
+        return next(_CONTAMINATION_AUTOMATON.iter(lower), None) is not None
     return any(term in lower for term in RULES["contamination_terms"])
 
 
@@ -642,20 +966,13 @@ def debug_extraction(report_text: str, label: str = "Report") -> dict:
 
     Returns a dictionary with all extraction results for debugging.
     """
-    try:
-        is_file = Path(report_text).exists()
-    except OSError:
-        is_file = False
-    processed_text = (
-        _process_with_docling(report_text)
-        if is_file
-        else report_text
-    )
+    processed_text = _process_with_docling(report_text)
 
-    organism = _parse_organism(processed_text)
-    cfu, cfu_ok = _parse_cfu(processed_text)
-    specimen = _parse_specimen(processed_text)
-    date = _parse_date(processed_text)
+    processed_lower = _ascii_lower(processed_text)
+    organism = _parse_organism(processed_text, processed_lower)
+    cfu, cfu_ok = _parse_cfu(processed_text, processed_lower)
+    specimen = _parse_specimen(processed_text, processed_lower)
+    date = _parse_date(processed_text, processed_lower)
     resistance = _parse_resistance_markers(processed_text)
     susceptibility = _parse_susceptibility_profile(processed_text)
 
@@ -691,6 +1008,14 @@ _RE_STOOL_RESULT_EXPLICIT = re.compile(
     r"(Positive|Negative|No\s+Growth|Growth\s+Detected|No\s+Pathogens|Pathogens\s+Found)",
     re.IGNORECASE,
 )
+# Known stool pathogens named anywhere in the text, for reports without a
+# labelled organism line (e.g. "Salmonella detected")
+_RE_STOOL_PATHOGEN_NAMES = re.compile(
+    r"\b(Salmonella|Shigella|Campylobacter|Clostridi(?:um|oides)\s+\w+|"
+    r"E(?:scherichia)?\.\s*coli|Listeria|Yersinia|Vibrio|Cryptosporidium|Giardia)\b",
+    re.IGNORECASE,
+)
+_RE_STOOL_NOTE_LINE = re.compile(r"^\s*(?:Note|Comment|Remark)s?\s*:", re.IGNORECASE)
 _STOOL_CULTURE_KEYWORDS = [
     "culture", "specimen", "organism", "pathogen", "bacteria",
     "isolated", "salmonella", "e. coli", "escherichia", "shigella",
@@ -724,12 +1049,7 @@ def _parse_stool_result(report_text: str) -> tuple:
     if organism is None:
         # Fallback: scan for known stool pathogens mentioned anywhere in the text
         # (stool reports often say "Salmonella detected" without a labelled prefix)
-        _STOOL_PATHOGEN_NAMES = re.compile(
-            r"\b(Salmonella|Shigella|Campylobacter|Clostridi(?:um|oides)\s+\w+|"
-            r"E(?:scherichia)?\.\s*coli|Listeria|Yersinia|Vibrio|Cryptosporidium|Giardia)\b",
-            re.IGNORECASE,
-        )
-        m_path = _STOOL_PATHOGEN_NAMES.search(text)
+        m_path = _RE_STOOL_PATHOGEN_NAMES.search(text)
         if m_path:
             organism = m_path.group(1).strip()
     pathogens = (
@@ -740,7 +1060,7 @@ def _parse_stool_result(report_text: str) -> tuple:
 
     # Collect any trailing comment lines as notes
     for line in text.splitlines():
-        if re.match(r"^\s*(?:Note|Comment|Remark)s?\s*:", line, re.IGNORECASE):
+        if _RE_STOOL_NOTE_LINE.match(line):
             notes = line.strip()
             break
 
@@ -795,12 +1115,17 @@ def _extract_stool_report(processed_text: str, specimen_type: str) -> "CultureRe
 # ---------------------------------------------------------------------------
 
 
-def extract_structured_data(report_text: str) -> CultureReport:
+def extract_structured_data(report_text: str, cache: bool = False) -> CultureReport:
     """
     Parse a free-text culture report into a typed CultureReport.
 
     Now supports direct file paths via Docling processing.
 
+    With cache=True, multi-line report text is parsed once and later calls
+    with the same text get a fresh copy of the cached report. Parse
+    warnings are only emitted the first time. Single-line input may name
+    a file whose contents change, so it is never cached.
+
     Rules:
         - Organism field: stripped, normalised via ORGANISM_ALIASES
         - CFU: commas removed, converted to int; TNTC=999999
@@ -811,6 +1136,9 @@ def extract_structured_data(report_text: str) -> CultureReport:
     Raises:
         ExtractionError: if both organism AND cfu fail to parse.
     """
+    if cache and "\n" in report_text:
+        return _copy_report(_extract_cached(report_text))
+
     # Pre-process with Docling (handles file paths or raw text)
     processed_text = _process_with_docling(report_text)
 
@@ -818,13 +1146,24 @@ def extract_structured_data(report_text: str) -> CultureReport:
     # Stool reports never have CFU values, so the generic ExtractionError guard below
     # would incorrectly drop valid negative stool cultures.  Detect specimen type first
     # and delegate so that cfu is always set to 0 and stool-specific fields are populated.
-    early_specimen = _parse_specimen(processed_text)
+    # Lowercase once for the case-insensitive parsers (None for non-ASCII text)
+    processed_lower = _ascii_lower(processed_text)
+    # The CFU / organism / specimen parsers strip their input; strip once
+    # here so their own strip() calls hand back the same string uncopied
+    stripped_text = processed_text.strip()
+    stripped_lower = processed_lower.strip() if processed_lower is not None else None
+
+    early_specimen = _parse_specimen(stripped_text, stripped_lower)
     if early_specimen == "stool":
         return _extract_stool_report(processed_text, early_specimen)
 
+    # The specimen scan above already covered processed_text; reuse its
+    # result below unless extraction falls back to the original text
+    specimen_type = early_specimen
+
     # Attempt extraction on processed text
-    organism = _parse_organism(processed_text)
-    cfu, cfu_ok = _parse_cfu(processed_text)
+    organism = _parse_organism(stripped_text, stripped_lower)
+    cfu, cfu_ok = _parse_cfu(stripped_text, stripped_lower)
 
     # Fallback: if extraction failed and text was modified by Docling, try original
     if (organism is None and not cfu_ok) and processed_text != report_text:
@@ -832,6 +1171,8 @@ def extract_structured_data(report_text: str) -> CultureReport:
         cfu, cfu_ok = _parse_cfu(report_text)
         if organism is not None or cfu_ok:
             processed_text = report_text  # Revert to original for other fields
+            processed_lower = _ascii_lower(processed_text)
+            specimen_type = _parse_specimen(processed_text, processed_lower)
 
     if organism is None and not cfu_ok:
         raise ExtractionError(
@@ -847,9 +1188,8 @@ def extract_structured_data(report_text: str) -> CultureReport:
         organism = "unknown"
 
     resistance_markers = _parse_resistance_markers(processed_text)
-    specimen_type = _parse_specimen(processed_text)
     contamination_flag = _is_contamination(organism)
-    date = _parse_date(processed_text)
+    date = _parse_date(processed_text, processed_lower)
     susceptibility_profile = _parse_susceptibility_profile(processed_text)
 
     return CultureReport(
@@ -864,6 +1204,48 @@ def extract_structured_data(report_text: str) -> CultureReport:
     )
 
 
+@functools.lru_cache(maxsize=4096)
+def _extract_cached(report_text: str) -> CultureReport:
+    """Memoized extract_structured_data; callers must not mutate the result."""
+    return extract_structured_data(report_text)
+
+
+def _copy_report(report: CultureReport) -> CultureReport:
+    """Copy a report deeply enough that mutating it leaves the cache intact."""
+    return dataclasses.replace(
+        report,
+        resistance_markers=list(report.resistance_markers),
+        susceptibility_profile=[
+            dataclasses.replace(s) for s in report.susceptibility_profile
+        ],
+    )
+
+
+def extract_structured_data_batch(
+    report_texts: list[str], workers: Optional[int] = None
+) -> list[CultureReport]:
+    """
+    Run extract_structured_data over many reports on a process pool.
+
+    Reports are independent, so a large batch scales with CPU cores; the
+    compiled patterns and automata are module-level, so each worker builds
+    them once at import. Results come back in input order. As with the
+    single-report call, an unparseable report raises ExtractionError.
+
+    With workers=1, or for batches of fewer than two reports, extraction
+    runs serially in-process and no pool is started.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(report_texts) < 2:
+        return [extract_structured_data(text) for text in report_texts]
+
+    chunksize = max(1, len(report_texts) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(extract_structured_data, report_texts, chunksize=chunksize)
+        )
+
+
 # =============================================================================
 # MedGemma Fallback Extraction
 # =============================================================================
@@ -896,6 +1278,15 @@ JSON Output:"""
     return prompt
 
 
+# JSON wrapped in a markdown code fence
+_RE_JSON_FENCE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+# Per-field "key": value patterns for responses that are not valid JSON
+_RE_JSON_FIELDS = {
+    key: re.compile(rf'"{key}"\s*:\s*([^,\}}]+)')
+    for key in ("organism", "cfu", "date", "specimen_type", "resistance_markers")
+}
+
+
 def _parse_medgemma_extraction_response(response: str) -> dict:
     """
     Parse MedGemma's JSON response into a dictionary.
@@ -904,23 +1295,24 @@ def _parse_medgemma_extraction_response(response: str) -> dict:
     """
     # Try to extract JSON from the response
     # Sometimes LLMs wrap JSON in markdown code blocks
-    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
+    json_match = _RE_JSON_FENCE.search(response)
     if json_match:
         response = json_match.group(1)
 
-    # Try to find raw JSON object
-    json_match = re.search(r'\{[\s\S]*"organism"[\s\S]*\}', response)
-    if json_match:
-        response = json_match.group(0)
+    # Try to find raw JSON object: first "{" through last "}", provided an
+    # "organism" key lies between them
+    start = response.find("{")
+    end = response.rfind("}")
+    if 0 <= start < end and response.find('"organism"', start, end) >= 0:
+        response = response[start:end + 1]
 
     try:
-        data = json.loads(response)
+        data = _json_loads(response)
     except json.JSONDecodeError:
         # Fallback: try to extract key-value pairs manually
         data = {}
-        for key in ["organism", "cfu", "date", "specimen_type", "resistance_markers"]:
-            pattern = rf'"{key}"\s*:\s*([^,\}}]+)'
-            match = re.search(pattern, response)
+        for key, pattern in _RE_JSON_FIELDS.items():
+            match = pattern.search(response)
             if match:
                 value = match.group(1).strip().strip('"')
                 if key == "cfu":
@@ -932,7 +1324,7 @@ def _parse_medgemma_extraction_response(response: str) -> dict:
                     # Parse list format
                     if value.startswith("["):
                         try:
-                            data[key] = json.loads(value)
+                            data[key] = _json_loads(value)
                         except:
                             data[key] = []
                     else:
@@ -970,7 +1362,7 @@ def extract_structured_data_with_fallback(
     Args:
         report_text: The raw culture report text
         medgemma_model: The MedGemma model (required for fallback)
-        medgemma_tokenizer: The MedGemma tokenizer (required for fallback)
+        medgemma_tokenizer: The MedGemma tokenizer from load_medgemma (required for fallback)
         use_medgemma_fallback: Whether to use MedGemma when regex fails
 
     Returns:
@@ -1007,6 +1399,64 @@ def extract_structured_data_with_fallback(
             )
 
 
+def extract_structured_data_with_fallback_batch(
+    report_texts: list[str],
+    medgemma_model=None,
+    medgemma_tokenizer=None,
+    use_medgemma_fallback: bool = True,
+    max_batch: int = 16,
+) -> list[CultureReport]:
+    """
+    Batch version of extract_structured_data_with_fallback.
+
+    Every report goes through regex extraction first. The reports that
+    fail are sent to MedGemma together, up to max_batch prompts per
+    generate call, so the decode steps are shared instead of run once
+    per report. Results come back in input order.
+
+    Raises:
+        ExtractionError: If a report fails regex extraction and no fallback
+            is available, or if the MedGemma fallback fails
+    """
+    reports: list[Optional[CultureReport]] = [None] * len(report_texts)
+    failed: list[tuple[int, ExtractionError]] = []
+    for i, text in enumerate(report_texts):
+        try:
+            reports[i] = extract_structured_data(text)
+        except ExtractionError as e:
+            failed.append((i, e))
+
+    if not failed:
+        return reports
+    if not use_medgemma_fallback or medgemma_model is None or medgemma_tokenizer is None:
+        raise failed[0][1]
+
+    import warnings
+    warnings.warn(
+        f"Regex extraction failed for {len(failed)} report(s), "
+        "attempting MedGemma fallback extraction.",
+        UserWarning,
+        stacklevel=2
+    )
+
+    for start in range(0, len(failed), max_batch):
+        chunk = failed[start:start + max_batch]
+        try:
+            responses = _generate_medgemma_extractions(
+                [report_texts[i] for i, _ in chunk],
+                medgemma_model, medgemma_tokenizer
+            )
+            for (i, _), response in zip(chunk, responses):
+                reports[i] = _report_from_medgemma_response(response)
+        except Exception as medgemma_error:
+            raise ExtractionError(
+                f"Extraction failed: regex extraction failed ({chunk[0][1]}) and "
+                f"MedGemma fallback also failed ({medgemma_error})."
+            )
+
+    return reports
+
+
 def _extract_with_medgemma(
     report_text: str,
     model,
@@ -1017,32 +1467,109 @@ def _extract_with_medgemma(
 
     This is an internal fallback function used when regex extraction fails.
     """
+    response = _generate_medgemma_extractions([report_text], model, tokenizer)[0]
+    return _report_from_medgemma_response(response)
+
+
+@functools.lru_cache(maxsize=1)
+def _json_close_criteria():
+    """
+    Return the StoppingCriteria subclass used by MedGemma extraction.
+
+    Built on first use so torch and transformers stay lazy imports.
+    """
     import torch
+    from transformers import StoppingCriteria
+
+    class _JsonCloseCriteria(StoppingCriteria):
+        """
+        Stop each row once the JSON object it is generating has closed.
+
+        Only the newest token of each row is decoded per step; a running
+        brace depth per row records when the outermost object closes.
+        """
+
+        def __init__(self, tokenizer, batch_size: int):
+            self.tokenizer = tokenizer
+            self.depth = [0] * batch_size
+            self.done = [False] * batch_size
+
+        def __call__(self, input_ids, scores, **kwargs):
+            tails = self.tokenizer.batch_decode(input_ids[:, -1:])
+            for row, tail in enumerate(tails):
+                if self.done[row]:
+                    continue
+                for ch in tail:
+                    if ch == "{":
+                        self.depth[row] += 1
+                    elif ch == "}" and self.depth[row] > 0:
+                        self.depth[row] -= 1
+                        if self.depth[row] == 0:
+                            self.done[row] = True
+                            break
+            return torch.tensor(
+                self.done, dtype=torch.bool, device=input_ids.device
+            )
+
+    return _JsonCloseCriteria
 
-    # Build the extraction prompt
-    prompt = _build_medgemma_extraction_prompt(report_text)
 
-    # Generate response from MedGemma
-    inputs = tokenizer(prompt, return_tensors="pt", truncation=True, max_length=2048)
-    inputs = {k: v.to(model.device) for k, v in inputs.items()}
+def _generate_medgemma_extractions(
+    report_texts: list[str],
+    model,
+    tokenizer
+) -> list[str]:
+    """
+    Run the extraction prompt for each report through one generate call.
 
-    with torch.no_grad():
+    Prompts are left-padded so every row ends at the same column and the
+    generated tokens can be sliced off after the prompt width. The padding
+    side and pad token are configured once by load_medgemma.
+    """
+    import torch
+    from transformers import StoppingCriteriaList
+
+    prompts = [_build_medgemma_extraction_prompt(text) for text in report_texts]
+
+    inputs = tokenizer(
+        prompts,
+        return_tensors="pt",
+        padding=True,
+        truncation=True,
+        max_length=2048,
+    )
+    # Pinned host memory lets the copy to the GPU run asynchronously
+    pin = model.device.type == "cuda"
+    inputs = {
+        k: (v.pin_memory() if pin else v).to(model.device, non_blocking=pin)
+        for k, v in inputs.items()
+    }
+
+    # Greedy decoding: extraction wants the single most likely answer, and
+    # each row stops as soon as its JSON object closes
+    stopping = StoppingCriteriaList(
+        [_json_close_criteria()(tokenizer, len(prompts))]
+    )
+    with torch.inference_mode():
         outputs = model.generate(
             **inputs,
-            max_new_tokens=256,
-            temperature=0.1,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=tokenizer.eos_token_id,
+            max_new_tokens=160,
+            do_sample=False,
+            num_beams=1,
+            use_cache=True,
+            stopping_criteria=stopping,
         )
 
-    # Decode the response
-    response = tokenizer.decode(outputs[0], skip_special_tokens=True)
+    # Keep only the generated tokens
+    prompt_len = inputs["input_ids"].shape[-1]
+    responses = tokenizer.batch_decode(
+        outputs[:, prompt_len:], skip_special_tokens=True
+    )
+    return [response.strip() for response in responses]
 
-    # Remove the prompt from the response
-    if prompt in response:
-        response = response[len(prompt):].strip()
 
+def _report_from_medgemma_response(response: str) -> CultureReport:
+    """Build a CultureReport from one MedGemma extraction response."""
     # Parse the JSON response
     extracted = _parse_medgemma_extraction_response(response)
 
@@ -1053,16 +1580,14 @@ def _extract_with_medgemma(
     specimen_type = extracted.get("specimen_type", "unknown")
     resistance_markers = extracted.get("resistance_markers", [])
 
-    # Normalize resistance markers
-    valid_markers = {"ESBL", "CRE", "MRSA", "VRE", "CRKP"}
-    resistance_markers = [
-        m.upper() for m in resistance_markers
-        if m.upper() in valid_markers
-    ]
+    # Normalize resistance markers: uppercase, known markers only, and
+    # deduplicated in first-seen order like the regex path
+    resistance_markers = list(dict.fromkeys(
+        upper for upper in map(str.upper, resistance_markers)
+        if upper in _VALID_MARKERS
+    ))
 
-    contamination_flag = any(
-        term in organism.lower() for term in RULES["contamination_terms"]
-    )
+    contamination_flag = _is_contamination(organism)
 
     return CultureReport(
         date=date,
@@ -13,6 +13,7 @@ Tab B (manual entry) is the existing flow — zero modifications.
 import logging
 import time
 import warnings
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Tuple
 
@@ -24,9 +25,10 @@ from extraction import (
     ExtractionError,
     debug_extraction,
     extract_structured_data,
+    get_docling_converter,
 )
 from hypothesis import generate_hypothesis
-from medgemma import call_medgemma
+from medgemma import call_medgemma_batch
 from pii_removal import detect_pii, scrub_pii
 from renderer import render_clinician_output, render_patient_output
 from rules import RULES
@@ -168,12 +170,10 @@ def process_pdf_file(pdf_path: str) -> Tuple[str, str, str]:
     debug_info = f"Processing: {Path(pdf_path).name}\n"
 
     try:
-        from docling.document_converter import DocumentConverter
-
-        debug_info += "✓ Docling imported successfully\n"
-
-        converter = DocumentConverter()
-        debug_info += "✓ DocumentConverter created\n"
+        # Shared with the extraction layer; built on the first upload only.
+        # Raises ImportError when Docling is not installed.
+        converter = get_docling_converter()
+        debug_info += "✓ DocumentConverter ready\n"
 
         start_time = time.time()
         result = converter.convert(pdf_path)
@@ -322,9 +322,15 @@ def _format_susceptibility_summary(report: CultureReport) -> str:
     if not report.susceptibility_profile:
         return "—"
 
-    s_count = sum(1 for s in report.susceptibility_profile if s.interpretation == "S")
-    i_count = sum(1 for s in report.susceptibility_profile if s.interpretation == "I")
-    r_count = sum(1 for s in report.susceptibility_profile if s.interpretation == "R")
+    s_count = i_count = r_count = 0
+    for s in report.susceptibility_profile:
+        interpretation = s.interpretation
+        if interpretation == "S":
+            s_count += 1
+        elif interpretation == "I":
+            i_count += 1
+        elif interpretation == "R":
+            r_count += 1
 
     total = len(report.susceptibility_profile)
     return f"{total} antibiotics: {s_count}S/{i_count}I/{r_count}R"
@@ -651,7 +657,7 @@ def build_gradio_app(model, tokenizer, is_stub: bool) -> gr.Blocks:
         if progress:
             progress(0.1, desc="Sorting reports by date...")
 
-        sorted_reports = sorted(reports, key=lambda r: r.date)
+        sorted_reports = sorted(reports, key=attrgetter("date"))
 
         if progress:
             progress(0.25, desc="Analyzing trends...")
@@ -662,16 +668,19 @@ def build_gradio_app(model, tokenizer, is_stub: bool) -> gr.Blocks:
         hypothesis = generate_hypothesis(trend, len(sorted_reports))
 
         if progress:
-            progress(0.55, desc="Generating patient explanation...")
-        patient_response = call_medgemma(
-            trend, hypothesis, "patient", model, tokenizer, is_stub, sorted_reports
-        )
-
-        if progress:
-            progress(0.75, desc="Generating clinician analysis...")
-        clinician_response = call_medgemma(
-            trend, hypothesis, "clinician", model, tokenizer, is_stub, sorted_reports
+            progress(0.55, desc="Generating patient and clinician analysis...")
+        # One batched generation pass for both output modes
+        responses = call_medgemma_batch(
+            trend,
+            hypothesis,
+            ["patient", "clinician"],
+            model,
+            tokenizer,
+            is_stub,
+            sorted_reports,
         )
+        patient_response = responses["patient"]
+        clinician_response = responses["clinician"]
 
         if progress:
             progress(0.9, desc="Formatting output...")
@@ -6,6 +6,7 @@ Handles:
   - System prompt constants for Patient and Clinician modes
   - Structured payload construction (raw_text NEVER included)
   - call_medgemma() inference with generation parameters from Section 8.6
+  - call_medgemma_batch() for generating several modes in one pass
 """
 
 from __future__ import annotations
@@ -165,10 +166,18 @@ def build_medgemma_payload(
 
 def load_medgemma(
     model_id: str = MODEL_ID,
+    load_in_8bit: bool = False,
 ) -> tuple:
     """
     Attempt to load MedGemma from HuggingFace.
 
+    Args:
+        model_id:     HuggingFace model id.
+        load_in_8bit: Quantize the linear layers to INT8 with bitsandbytes,
+                      roughly halving weight memory and the bytes read per
+                      decode step. Falls back to bfloat16 if bitsandbytes
+                      is not installed.
+
     Returns:
         (model, tokenizer, is_stub) tuple.
         is_stub=True means the stub fallback is active (no GPU / model unavailable).
@@ -189,14 +198,35 @@ def load_medgemma(
             )
             return None, None, True
 
+        quantization_config = None
+        if load_in_8bit:
+            try:
+                import bitsandbytes  # noqa: F401
+                from transformers import BitsAndBytesConfig
+
+                quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+            except ImportError:
+                warnings.warn(
+                    "bitsandbytes is not installed; loading MedGemma in bfloat16.",
+                    UserWarning,
+                    stacklevel=2,
+                )
+
         print(f"Loading {model_id} on GPU ({torch.cuda.get_device_name(0)}) ...")
         tokenizer = AutoTokenizer.from_pretrained(model_id)
         model = AutoModelForCausalLM.from_pretrained(
             model_id,
             torch_dtype=torch.bfloat16,
             device_map="auto",
+            quantization_config=quantization_config,
         )
         model.eval()
+        # Decoder-only batching: pad on the left so every prompt ends where
+        # generation starts. Set once here for every generate call.
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        model.generation_config.pad_token_id = tokenizer.pad_token_id
         print("MedGemma loaded successfully.")
         return model, tokenizer, False
 
@@ -321,20 +351,41 @@ def _stub_response(mode: str, trend: TrendResult, hypothesis: HypothesisResult)
 # ---------------------------------------------------------------------------
 
 
-def call_medgemma(
+def _build_messages(
+    mode: str,
     trend: TrendResult,
     hypothesis: HypothesisResult,
-    mode: str,
+    reports: list = None,
+) -> list[dict]:
+    """Build the system + user chat turns for one output mode."""
+    system_prompt = (
+        PATIENT_SYSTEM_PROMPT if mode == "patient" else CLINICIAN_SYSTEM_PROMPT
+    )
+    user_content = build_medgemma_payload(trend, hypothesis, mode, reports)
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def call_medgemma_batch(
+    trend: TrendResult,
+    hypothesis: HypothesisResult,
+    modes: list[str],
     model=None,
     tokenizer=None,
     is_stub: bool = True,
     reports: list = None,
-) -> str:
+) -> dict[str, str]:
     """
-    Call MedGemma with a fully structured JSON payload.
+    Call MedGemma once for several output modes of the same analysis.
+
+    All prompts are left-padded into one batch and decoded in a single
+    model.generate() call, so producing both the patient and clinician
+    responses costs one generation pass instead of two.
 
-    If is_stub=True (no GPU / model unavailable), returns a templated
-    fallback response so the notebook continues to execute end-to-end.
+    If is_stub=True (no GPU / model unavailable), returns templated
+    fallback responses so the notebook continues to execute end-to-end.
 
     Generation parameters (Section 8.6):
         max_new_tokens=512, temperature=0.3, top_p=0.9,
@@ -343,39 +394,35 @@ def call_medgemma(
     Args:
         trend:      TrendResult from trend engine.
         hypothesis: HypothesisResult from hypothesis layer.
-        mode:       "patient" | "clinician"
+        modes:      Any of "patient" | "clinician", e.g. ["patient", "clinician"]
         model:      Loaded HuggingFace model (None if stub).
-        tokenizer:  Loaded HuggingFace tokenizer (None if stub).
+        tokenizer:  Tokenizer from load_medgemma (None if stub).
         is_stub:    True → use stub fallback.
+        reports:    Optional list of CultureReport objects for susceptibility data.
 
     Returns:
-        Decoded string response (special tokens stripped).
+        Dict mapping each mode to its decoded response (special tokens stripped).
     """
     if is_stub or model is None or tokenizer is None:
-        return _stub_response(mode, trend, hypothesis)
+        return {m: _stub_response(m, trend, hypothesis) for m in modes}
 
     import torch
 
-    system_prompt = (
-        PATIENT_SYSTEM_PROMPT if mode == "patient" else CLINICIAN_SYSTEM_PROMPT
-    )
-    user_content = build_medgemma_payload(trend, hypothesis, mode, reports)
-
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_content},
-    ]
+    conversations = [_build_messages(m, trend, hypothesis, reports) for m in modes]
 
-    # Apply chat template
-    input_ids = tokenizer.apply_chat_template(
-        messages,
+    # The tokenizer pads on the left (set by load_medgemma), so every
+    # prompt ends where generation starts
+    inputs = tokenizer.apply_chat_template(
+        conversations,
         return_tensors="pt",
         add_generation_prompt=True,
+        padding=True,
+        return_dict=True,
     ).to(model.device)
 
-    with torch.no_grad():
+    with torch.inference_mode():
         output_ids = model.generate(
-            input_ids,
+            **inputs,
             max_new_tokens=512,
             temperature=0.3,
             top_p=0.9,
@@ -384,6 +431,37 @@ def call_medgemma(
         )
 
     # Decode only the newly generated tokens
-    new_tokens = output_ids[0][input_ids.shape[-1] :]
-    response = tokenizer.decode(new_tokens, skip_special_tokens=True)
-    return response.strip()
+    new_tokens = output_ids[:, inputs["input_ids"].shape[-1] :]
+    responses = tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+    return {m: r.strip() for m, r in zip(modes, responses)}
+
+
+def call_medgemma(
+    trend: TrendResult,
+    hypothesis: HypothesisResult,
+    mode: str,
+    model=None,
+    tokenizer=None,
+    is_stub: bool = True,
+    reports: list = None,
+) -> str:
+    """
+    Call MedGemma with a fully structured JSON payload for a single mode.
+
+    Thin wrapper over call_medgemma_batch(); see there for generation
+    parameters and stub behaviour.
+
+    Args:
+        trend:      TrendResult from trend engine.
+        hypothesis: HypothesisResult from hypothesis layer.
+        mode:       "patient" | "clinician"
+        model:      Loaded HuggingFace model (None if stub).
+        tokenizer:  Loaded HuggingFace tokenizer (None if stub).
+        is_stub:    True → use stub fallback.
+
+    Returns:
+        Decoded string response (special tokens stripped).
+    """
+    return call_medgemma_batch(
+        trend, hypothesis, [mode], model, tokenizer, is_stub, reports
+    )[mode]
@@ -0,0 +1,42 @@
+"""
+Unit tests for the evaluation report bookkeeping.
+Ensures summary() always agrees with the recorded results.
+"""
+
+import unittest
+
+from evaluation import EvalReport, EvalResult
+
+
+class TestEvalReportSummary(unittest.TestCase):
+    """Test that summary() counts exactly the results in the report."""
+
+    def test_summary_counts_added_results(self):
+        """Passes and failures recorded through add() are both counted."""
+        report = EvalReport()
+        report.add(EvalResult("T-01", "Dim", True))
+        report.add(EvalResult("T-02", "Dim", False))
+        self.assertEqual(
+            report.summary(), {"total": 2, "passed": 1, "failed": 1}
+        )
+
+    def test_results_cannot_be_appended_directly(self):
+        """Appending to results is rejected, so a failure cannot go uncounted."""
+        report = EvalReport()
+        report.add(EvalResult("T-01", "Dim", True))
+        with self.assertRaises(AttributeError):
+            report.results.append(EvalResult("T-02", "Dim", False))
+        self.assertEqual(len(report.results), report.summary()["total"])
+        self.assertEqual(
+            report.summary(), {"total": 1, "passed": 1, "failed": 0}
+        )
+
+    def test_results_cannot_be_replaced(self):
+        """The results attribute itself cannot be reassigned."""
+        report = EvalReport()
+        with self.assertRaises(AttributeError):
+            report.results = [EvalResult("T-01", "Dim", False)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,12 @@ Kaggle-native inline tests (no pytest dependency).
 
 import warnings
 
-from extraction import ExtractionError, extract_structured_data
+from extraction import (
+    ExtractionError,
+    extract_structured_data,
+    extract_structured_data_batch,
+    extract_structured_data_with_fallback_batch,
+)
 
 _PASS = 0
 _FAIL = 0
@@ -351,6 +356,61 @@ try:
 except ExtractionError as e:
     _assert(False, f"Extraction failed for stool culture test: {e}")
 
+# ---------------------------------------------------------------------------
+# Batch extraction — same reports, same order as one-at-a-time extraction.
+# workers=1 takes the serial path, so no process pool is started here
+# (this file is also inlined into the notebook).
+# ---------------------------------------------------------------------------
+print("\n=== Test: Batch Extraction ===")
+_batch_inputs = [REPORT_NORMAL, REPORT_CONTAMINATION, REPORT_KEYWORD_STOOL]
+_batch = extract_structured_data_batch(_batch_inputs, workers=1)
+_assert(
+    _batch == [extract_structured_data(t) for t in _batch_inputs],
+    "batch results match per-report extraction, in input order",
+)
+
+print("\n=== Test: Batch Extraction With Fallback ===")
+_assert(
+    extract_structured_data_with_fallback_batch(_batch_inputs)
+    == [extract_structured_data(t) for t in _batch_inputs],
+    "reports that parse never reach the fallback",
+)
+try:
+    extract_structured_data_with_fallback_batch(
+        [REPORT_NORMAL, "this report contains absolutely nothing useful at all"]
+    )
+    _assert(False, "ExtractionError should have been raised without a model")
+except ExtractionError:
+    _assert(True, "failed report without a model raises ExtractionError")
+
+print("\n=== Test: Cached Extraction ===")
+_REPORT_TABLE = REPORT_NORMAL + "\n| Ampicillin | >=32 | R | >=32 | |\n"
+_cached = extract_structured_data(_REPORT_TABLE, cache=True)
+_assert(
+    _cached == extract_structured_data(_REPORT_TABLE),
+    "cached extraction matches uncached extraction",
+)
+_cached.resistance_markers.append("VRE")
+_cached.susceptibility_profile[0].interpretation = "I"
+_assert(
+    extract_structured_data(_REPORT_TABLE, cache=True)
+    == extract_structured_data(_REPORT_TABLE),
+    "mutating a cached result leaves the cache intact",
+)
+
+print("\n=== Test: Susceptibility Rows With Long Padding ===")
+# Wide PDF tables pad cells heavily; these used to backtrack for seconds
+_padded = extract_structured_data(
+    REPORT_NORMAL
+    + "\n| Ampicillin" + " " * 2000 + "| >=32 |" + " " * 2000 + "R | >=32 | |\n"
+    + "Agent: x" + " " * 2000 + "q\n"
+)
+_assert(
+    [(s.antibiotic, s.mic, s.interpretation) for s in _padded.susceptibility_profile]
+    == [("Ampicillin", ">=32", "R")],
+    "padded markdown row parsed, padded non-row ignored",
+)
+
 # ---------------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------------
@@ -4,7 +4,7 @@ Kaggle-native inline tests (no pytest dependency).
 """
 
 from data_models import CultureReport
-from trend import analyze_trend
+from trend import analyze_trend, build_report_batch
 
 _PASS = 0
 _FAIL = 0
@@ -362,6 +362,25 @@ _assert(
     f"Ciprofloxacin in evolved_antibiotics  (got {t15.evolved_antibiotics})",
 )
 
+# ---------------------------------------------------------------------------
+# 16. build_report_batch: column-oriented view of the reports
+# ---------------------------------------------------------------------------
+print("\n=== Test: build_report_batch (struct-of-arrays) ===")
+b16 = build_report_batch(rpts15)
+_assert(b16.cfu == [100000, 80000, 60000], f"cfu column  (got {b16.cfu})")
+_assert(
+    b16.dates == ["2026-02-01", "2026-02-08", "2026-02-15"],
+    f"dates column  (got {b16.dates})",
+)
+_assert(
+    b16.antibiotic_names == ["Ciprofloxacin"],
+    f"antibiotic_names  (got {b16.antibiotic_names})",
+)
+_assert(
+    b16.interpretation_matrix == [[0], [1], [2]],
+    f"interpretation_matrix S/I/R codes  (got {b16.interpretation_matrix})",
+)
+
 # ---------------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------------
@@ -5,7 +5,7 @@ Computes TrendResult from a sorted list of CultureReport objects.
 
 from typing import List
 
-from data_models import CultureReport, TrendResult
+from data_models import CultureReport, CultureReportBatch, TrendResult
 from rules import RULES, ORGANISM_ALIASES, ANTIBIOTIC_CLASSES
 
 
@@ -82,7 +82,57 @@ def _check_resistance_evolution(reports: List[CultureReport]) -> bool:
     return bool(later_markers - baseline)
 
 
-def _check_susceptibility_evolution(reports: List[CultureReport]) -> tuple:
+# S/I/R interpretation codes used in CultureReportBatch.interpretation_matrix
+_INTERP_CODES = {
+    "S": 0,
+    "SENSITIVE": 0,
+    "SUSCEPTIBLE": 0,
+    "I": 1,
+    "INTERMEDIATE": 1,
+    "R": 2,
+    "RESISTANT": 2,
+}
+
+
+def build_report_batch(reports: List[CultureReport]) -> CultureReportBatch:
+    """
+    Transpose a list of CultureReports into a column-oriented batch.
+
+    Antibiotic columns are keyed case-insensitively. Columns follow the order
+    of the final report's susceptibility table, then any antibiotics seen only
+    in earlier reports. Display names come from the latest report listing the
+    antibiotic. If a report lists an antibiotic twice, the last row wins.
+    """
+    columns: dict = {}  # normalized antibiotic -> column index
+    names: List[str] = []
+    for r in reversed(reports):
+        for susc in r.susceptibility_profile:
+            name = susc.antibiotic.strip()
+            key = name.lower()
+            if key not in columns:
+                columns[key] = len(names)
+                names.append(name)
+
+    matrix = []
+    for r in reports:
+        row = [-1] * len(names)
+        for susc in r.susceptibility_profile:
+            col = columns[susc.antibiotic.strip().lower()]
+            row[col] = _INTERP_CODES.get(susc.interpretation.strip().upper(), -1)
+        matrix.append(row)
+
+    return CultureReportBatch(
+        dates=[r.date for r in reports],
+        organisms=[r.organism for r in reports],
+        cfu=[r.cfu for r in reports],
+        resistance_markers=[list(r.resistance_markers) for r in reports],
+        contamination_flags=[r.contamination_flag for r in reports],
+        antibiotic_names=names,
+        interpretation_matrix=matrix,
+    )
+
+
+def _check_susceptibility_evolution(batch: CultureReportBatch) -> tuple:
     """
     Detect S→I, S→R, or I→R transitions for the same antibiotic.
 
@@ -90,51 +140,24 @@ def _check_susceptibility_evolution(reports: List[CultureReport]) -> tuple:
     compared to baseline. Transient changes that later resolved do NOT count
     as evolution - we care about the current state.
 
+    With S=0, I=1, R=2 this is a single column-wise comparison of the first
+    and last rows of the interpretation matrix.
+
     Returns:
         (has_evolution, evolved_antibiotics)
         - has_evolution: True if final report shows worsened susceptibility vs baseline
         - evolved_antibiotics: List of antibiotics with ongoing worsened susceptibility
     """
-    if len(reports) < 2:
+    matrix = batch.interpretation_matrix
+    if len(matrix) < 2:
         return False, []
 
-    def normalize_interp(interp: str) -> str:
-        """Normalize interpretation to single letter: S, I, or R."""
-        upper = interp.strip().upper()
-        if upper in ("S", "SENSITIVE", "SUSCEPTIBLE"):
-            return "S"
-        elif upper in ("I", "INTERMEDIATE"):
-            return "I"
-        elif upper in ("R", "RESISTANT"):
-            return "R"
-        return upper
-
-    # Build baseline from first report
-    baseline: dict = {}  # antibiotic -> interpretation
-    for susc in reports[0].susceptibility_profile:
-        abx = susc.antibiotic.strip().lower()
-        baseline[abx] = normalize_interp(susc.interpretation)
-
-    # Build final state from LAST report
-    final_state: dict = {}  # antibiotic -> interpretation
-    for susc in reports[-1].susceptibility_profile:
-        abx = susc.antibiotic.strip().lower()
-        final_state[abx] = normalize_interp(susc.interpretation)
-
-    # Check if final state shows worsening vs baseline
-    evolved = []
-    for abx, final_interp in final_state.items():
-        if abx in baseline:
-            baseline_interp = baseline[abx]
-            # Detect worsening: S→I, S→R, I→R (compare final vs baseline)
-            if (baseline_interp == "S" and final_interp in ("I", "R")) or \
-               (baseline_interp == "I" and final_interp == "R"):
-                # Find original case from reports for display
-                for susc in reports[-1].susceptibility_profile:
-                    if susc.antibiotic.strip().lower() == abx:
-                        evolved.append(susc.antibiotic.strip())
-                        break
-
+    baseline, final = matrix[0], matrix[-1]
+    evolved = [
+        name
+        for name, base, last in zip(batch.antibiotic_names, baseline, final)
+        if base >= 0 and last > base
+    ]
     return len(evolved) > 0, evolved
 
 
@@ -181,11 +204,6 @@ def _check_multi_drug_resistance(reports: List[CultureReport]) -> bool:
     return False
 
 
-def _build_resistance_timeline(reports: List[CultureReport]) -> List[List[str]]:
-    """Return per-report resistance marker lists, in report order."""
-    return [list(r.resistance_markers) for r in reports]
-
-
 def _check_recurrent_organism(reports: List[CultureReport]) -> bool:
     """
     Return True if the same organism recurs after apparent resolution.
@@ -267,21 +285,24 @@ def analyze_trend(reports: List[CultureReport]) -> TrendResult:
     if not reports:
         raise ValueError("analyze_trend requires at least one CultureReport.")
 
-    cfu_values = [r.cfu for r in reports]
+    # Transpose once; the column scans below read from the batch
+    batch = build_report_batch(reports)
+
+    cfu_values = batch.cfu
     cfu_deltas = _compute_deltas(cfu_values)
     cfu_trend = _classify_cfu_trend(cfu_values)
-    organism_list = [r.organism for r in reports]
+    organism_list = batch.organisms
     organism_persistent = check_persistence(organism_list)
     resistance_evolution = _check_resistance_evolution(reports)
-    resistance_timeline = _build_resistance_timeline(reports)
-    report_dates = [r.date for r in reports]
+    resistance_timeline = batch.resistance_markers
+    report_dates = batch.dates
 
-    any_contamination = any(r.contamination_flag for r in reports)
+    any_contamination = any(batch.contamination_flags)
     multi_drug_resistance = _check_multi_drug_resistance(reports)
     recurrent_organism_30d = _check_recurrent_organism(reports)
 
     # Check for susceptibility evolution (S→I, S→R, I→R transitions)
-    susc_evolution, evolved_antibiotics = _check_susceptibility_evolution(reports)
+    susc_evolution, evolved_antibiotics = _check_susceptibility_evolution(batch)
 
     # Combined resistance evolution: either high-risk markers or susceptibility changes
     combined_resistance_evolution = resistance_evolution or susc_evolution